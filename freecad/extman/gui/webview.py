@@ -19,22 +19,42 @@
 # *                                                                         *
 # ***************************************************************************
 
+import functools
 import json
+import mmap
+import os
 import re
 from pathlib import Path
 from urllib.parse import unquote
 
+import shiboken2
 from PySide import QtCore, QtGui
 from PySide.QtCore import Qt
 from PySide2 import QtWebChannel
 from PySide2.QtWebEngineCore import QWebEngineUrlSchemeHandler
-from PySide2.QtWebEngineWidgets import QWebEngineSettings, QWebEngineView, QWebEnginePage
+from PySide2.QtWebEngineWidgets import QWebEngineProfile, QWebEngineSettings, QWebEngineView, QWebEnginePage
 
 from freecad.extman import log
+from freecad.extman.utils.worker import Worker
 
 EXTMAN_URL_SCHEME = b'extman'                               # extman://...
 WINDOWS_PATH_PATTERN = re.compile(r'^/([a-zA-Z]:.*)')       # /C:... Windows insanity
-ACTION_URL_PATTERN = re.compile(r'.*/action\.(\w+)$')       # action.<name>
+ACTION_URL_PATTERN = re.compile(r'/action\.(\w+)$')         # action.<name>
+
+# Extension => content type of all the supported static assets.
+# Pre-encoded to bytes because QWebEngineUrlRequestJob.reply wants bytes.
+MIME_TYPES = {
+    '.svg': b'image/svg+xml',
+    '.png': b'image/png',
+    '.jpg': b'image/jpeg',
+    '.jpeg': b'image/jpeg',
+    '.css': b'text/css',
+    '.js': b'text/javascript',
+    '.html': b'text/html',
+    '.woff2': b'font/woff2',
+}
+DEFAULT_MIME_TYPE = b'text/plain'
+HTML_MIME_TYPE = MIME_TYPES['.html']
 
 
 class Response(QtCore.QObject):
@@ -45,12 +65,20 @@ class Response(QtCore.QObject):
         self.request = request
 
     def write(self, data):
-        self.buffer.write(data.encode())
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            self.buffer.write(data)
+        else:
+            self.buffer.write(data.encode('utf-8'))
 
     def send(self, content_type='text/html'):
+        # Rewind only: the buffer stays open so reply() can read it
+        # directly, cleanup is handled by the destroyed-signal deleteLater
         self.buffer.seek(0)
-        self.buffer.close()
-        self.request.reply(content_type.encode(), self.buffer)
+        if content_type == 'text/html':
+            content_type = HTML_MIME_TYPE
+        elif not isinstance(content_type, bytes):
+            content_type = content_type.encode()
+        self.request.reply(content_type, self.buffer)
 
 
 class SchemeHandler(QWebEngineUrlSchemeHandler):
@@ -66,28 +94,17 @@ class SchemeHandler(QWebEngineUrlSchemeHandler):
 
         # Parse Url
         url = request.requestUrl()
-        path = url.path()
-        query = QtCore.QUrlQuery(url)
-        params = {k: unquote(v) for k, v in query.queryItems()}
-
-        # Fix Windows URL (This is insane)
-        win_fix = WINDOWS_PATH_PATTERN.match(path)
-        if win_fix:
-            path = win_fix.group(1)
-
-        # Prepare response buffer
-        buf = QtCore.QBuffer(parent=self)
-        request.destroyed.connect(buf.deleteLater)
-        buf.open(QtCore.QIODevice.WriteOnly)
-
-        # Match Action
-        action = None
-        action_match = ACTION_URL_PATTERN.match(path)
-        if action_match:
-            action = action_match.group(1)
+        path, action = parse_request_path(url.path())
+        items = QtCore.QUrlQuery(url).queryItems()
+        params = {k: unquote(v) for k, v in items} if items else {}
 
         if path.endswith('.html') or action:
 
+            # Prepare response buffer (ReadWrite: reply() reads it back)
+            buf = QtCore.QBuffer(parent=self)
+            request.destroyed.connect(buf.deleteLater)
+            buf.open(QtCore.QIODevice.ReadWrite)
+
             # Prepare Response object
             response = Response(self, buf, request)
             request.destroyed.connect(response.deleteLater)
@@ -100,18 +117,40 @@ class SchemeHandler(QWebEngineUrlSchemeHandler):
 
         else:
 
-            file_path = Path(path)
-            content_type = get_supported_mimetype(file_path)
-            if file_path.exists():
-                with open(file_path, 'rb') as f:
-                    buf.write(f.read())
-                    buf.seek(0)
-                    buf.close()
-                    request.reply(content_type.encode(), buf)
+            buf = QtCore.QBuffer(parent=self)
+            request.destroyed.connect(buf.deleteLater)
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                request.reply(DEFAULT_MIME_TYPE, buf)
+                log("Path does not exists: ", path)
+                return
+
+            cached = static_asset_cache.get(path)
+            if cached and cached[0] == mtime:
+                # Cache hit: reply right away
+                buf.setData(cached[2])  # QByteArray is implicitly shared, no copy
+                request.reply(cached[1], buf)
             else:
-                buf.close()
-                request.reply(content_type.encode(), buf)
-                log("Path does not exists: ", str(file_path))
+                # Cache miss: read the file off the GUI thread
+                worker = Worker(load_static_asset, path, mtime)
+                worker.signals.finished.connect(
+                    functools.partial(self.replyStaticAsset, request, buf, worker))
+                worker.start()
+
+    def replyStaticAsset(self, request, buf, worker, result):
+        # The job (and with it the buffer) dies if the load is aborted
+        # while the worker was reading, drop the reply in that case
+        if not (shiboken2.isValid(request) and shiboken2.isValid(buf)):
+            return
+        value, error, _ = result
+        if error or value is None:
+            request.reply(DEFAULT_MIME_TYPE, buf)
+            log("Static asset load failed: ", str(error))
+        else:
+            content_type, data = value
+            buf.setData(data)
+            request.reply(content_type, buf)
 
 
 class Page(QWebEnginePage):
@@ -143,6 +182,24 @@ class MessageBus(QtCore.QObject):
             self.message.emit(json.dumps(response_data))
 
 
+shared_profile = None
+
+
+def get_shared_profile(work_path):
+    """
+    Returns the QWebEngineProfile shared by all WebView instances,
+    creating and configuring it on first use. Sharing avoids
+    re-configuring storage paths per view and lets views share the
+    HTTP cache.
+    """
+    global shared_profile
+    if shared_profile is None:
+        shared_profile = QWebEngineProfile('extman')
+        shared_profile.setPersistentStoragePath(str(Path(work_path, 'web_data')))
+        shared_profile.setCachePath(str(Path(work_path, 'web_cache')))
+    return shared_profile
+
+
 class WebView(QtGui.QMdiSubWindow):
 
     closed = QtCore.Signal(object)
@@ -162,29 +219,25 @@ class WebView(QtGui.QMdiSubWindow):
         self.webView.setContextMenuPolicy(Qt.NoContextMenu)
         self.setWidget(self.webView)
 
-        # Page setup
-        self.webView.setPage(Page(self.webView))
-
-        # Profile setup
-        profile = self.webView.page().profile()
-        profile.setPersistentStoragePath(str(Path(work_path, 'web_data')))
-        profile.setCachePath(str(Path(work_path, 'web_cache')))
+        # Profile setup (one profile shared by all WebView instances)
+        profile = get_shared_profile(work_path)
         handler = profile.urlSchemeHandler(EXTMAN_URL_SCHEME)
         if handler is not None:
             profile.removeUrlSchemeHandler(handler)
         profile.installUrlSchemeHandler(EXTMAN_URL_SCHEME, self.handler)
 
-        # Setting setup
-        settings = self.webView.settings()
-        settings.setAttribute(QWebEngineSettings.AutoLoadIconsForPage, True)
-        settings.setAttribute(QWebEngineSettings.LocalContentCanAccessFileUrls, True)
-        settings.setAttribute(QWebEngineSettings.LocalContentCanAccessRemoteUrls, True)
+        # Page setup (on the shared profile)
+        self.webView.setPage(Page(profile, self.webView))
 
-        # Page settings
-        page = self.webView.page().settings()
-        page.setAttribute(QWebEngineSettings.LocalContentCanAccessFileUrls, True)
-        page.setAttribute(QWebEngineSettings.LocalContentCanAccessRemoteUrls, True)
-        page.setAttribute(QWebEngineSettings.LocalStorageEnabled, True)
+        # Settings setup (view and page share the same settings object,
+        # so each attribute is set exactly once)
+        set_attribute = self.webView.page().settings().setAttribute
+        for attr, value in (
+                (QWebEngineSettings.AutoLoadIconsForPage, True),
+                (QWebEngineSettings.LocalContentCanAccessFileUrls, True),
+                (QWebEngineSettings.LocalContentCanAccessRemoteUrls, True),
+                (QWebEngineSettings.LocalStorageEnabled, True)):
+            set_attribute(attr, value)
 
         # WebChannel Setup
         self.messageBus = MessageBus(message_handler, self.webView)
@@ -200,23 +253,59 @@ class WebView(QtGui.QMdiSubWindow):
         self.webView.load(url)
 
 
+@functools.lru_cache(maxsize=256)
+def parse_request_path(path):
+    """
+    Returns (path, action) with the Windows drive fix applied and the
+    action name extracted. Asset paths repeat on every navigation, so
+    the regex work is memoized.
+    """
+    # Fix Windows URL (This is insane). Cheap drive-letter probe first,
+    # the regex only runs for paths that can actually match.
+    if len(path) > 2 and path[2] == ':':
+        win_fix = WINDOWS_PATH_PATTERN.match(path)
+        if win_fix:
+            path = win_fix.group(1)
+
+    # Match Action. Substring probe skips the regex engine for the
+    # overwhelming majority of requests (assets, pages).
+    action = None
+    if '/action.' in path:
+        action_match = ACTION_URL_PATTERN.search(path)
+        if action_match:
+            action = action_match.group(1)
+    return path, action
+
+
 def get_supported_mimetype(path):
-    name = path.name.lower()
-    if name.endswith('.svg'):
-        content_type = 'image/svg+xml'
-    elif name.endswith('.png'):
-        content_type = 'image/png'
-    elif name.endswith('.jpg'):
-        content_type = 'image/jpeg'
-    elif name.endswith('.jpeg'):
-        content_type = 'image/jpeg'
-    elif name.endswith('.css'):
-        content_type = 'text/css'
-    elif name.endswith('.js'):
-        content_type = 'text/javascript'
-    else:
-        content_type = 'text/plain'
-    return content_type
+    return MIME_TYPES.get(path.suffix.lower(), DEFAULT_MIME_TYPE)
+
+
+# path => (mtime, content_type, QByteArray) of already served assets
+static_asset_cache = {}
+
+
+def load_static_asset(path, mtime):
+    """
+    Returns (content_type, QByteArray) for a static file. The same
+    icons/css/js are requested on every navigation, so results are
+    cached; a changed mtime invalidates the entry.
+    """
+    cached = static_asset_cache.get(path)
+    if cached and cached[0] == mtime:
+        return cached[1], cached[2]
+    content_type = MIME_TYPES.get(os.path.splitext(path)[1].lower(), DEFAULT_MIME_TYPE)
+    # Memory-map instead of read() to skip the intermediate
+    # userspace copy, QByteArray copies straight from the map.
+    # mmap rejects zero-length files, serve those as an empty body.
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            data = QtCore.QByteArray()
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                data = QtCore.QByteArray(bytes(mm))
+    static_asset_cache[path] = (mtime, content_type, data)
+    return content_type, data
 
 
 # ! Call as soon as possible
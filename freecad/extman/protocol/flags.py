@@ -19,32 +19,64 @@
 # *                                                                         *
 # ***************************************************************************
 
-import functools
 import itertools
 import json
+import os
+import sys
+
+# orjson parses noticeably faster; optional, stdlib json is the fallback
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 from freecad.extman import tr, get_resource_path
 
+# Shared default for packages without predefined flags
+EMPTY_FLAGS = frozenset()
+
+# (mtime_ns, db) of the last parsed flags.json
+flags_database_cache = (None, None)
+
 
-@functools.lru_cache()
 def get_flags_database():
     """
     Reads resources/data/flags.json
-    returns dict( "{pkg.type:pkg.name.lower()}" => flags )
+    returns dict( (pkg.type, pkg.name.lower()) => frozenset of flag ids )
+    Cached per file mtime: hot calls cost one stat, and the file is
+    reparsed if something updates it during the session.
     """
+    global flags_database_cache
+
+    path = get_resource_path('data', 'flags.json')
+    mtime = os.stat(path).st_mtime_ns
+    cached_mtime, cached_db = flags_database_cache
+    if mtime == cached_mtime:
+        return cached_db
 
     db = {}
-    with open(get_resource_path('data', 'flags.json'), 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    with open(path, 'rb') as f:
+        raw = f.read()
+        data = orjson.loads(raw) if orjson else json.loads(raw)
         for flagId, flag in data.items():
+            flagId = sys.intern(flagId)
             mods = flag.get('Mod', [])
             macros = flag.get('Macro', [])
             items = itertools.chain(((m, 'Mod') for m in mods), ((m, 'Macro') for m in macros))
             for name, mtype in items:
-                key = "{0}:{1}".format(mtype, name.lower())
-                mod = db.get(key, {})
-                mod[flagId] = True
-                db[key] = mod
+                # Interned tuple keys: no per-lookup string formatting,
+                # and dict probes hit the pointer-identity fast path
+                # when packages are flagged in a tight loop
+                key = (mtype, sys.intern(name.lower()))
+                db.setdefault(key, set()).add(flagId)
+
+    # Freeze the flag sets, sharing one frozenset per distinct combination
+    shared = {}
+    for key, flag_set in db.items():
+        frozen = frozenset(flag_set)
+        db[key] = shared.setdefault(frozen, frozen)
+
+    flags_database_cache = (mtime, db)
     return db
 
 
@@ -52,10 +84,33 @@ def apply_predefined_flags(pkg):
     package_type = pkg.type
     if package_type == 'Workbench':
         package_type = 'Mod'
-    flags = get_flags_database().get("{0}:{1}".format(package_type, pkg.name.lower()), [])
+    flags = get_flags_database().get((package_type, pkg.name.lower()), EMPTY_FLAGS)
     if flags:
+        # pkg.flags is a dict (see PackageInfo), which also keeps the
+        # package caches serializable
         if pkg.flags:
-            pkg.flags.update(flags)
+            pkg.flags.update(dict.fromkeys(flags, True))
         else:
-            pkg.flags = flags
+            pkg.flags = dict.fromkeys(flags, True)
     return pkg
+
+
+def apply_predefined_flags_many(pkgs):
+    """
+    Applies predefined flags to a whole package list. Same effect as
+    calling apply_predefined_flags per package, but the database get is
+    localized out of the loop.
+    """
+    get = get_flags_database().get
+    for pkg in pkgs:
+        package_type = pkg.type
+        if package_type == 'Workbench':
+            package_type = 'Mod'
+        flags = get((package_type, pkg.name.lower()))
+        if not flags:
+            continue
+        if pkg.flags:
+            pkg.flags.update(dict.fromkeys(flags, True))
+        else:
+            pkg.flags = dict.fromkeys(flags, True)
+    return pkgs
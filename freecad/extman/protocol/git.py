@@ -200,7 +200,7 @@ class GitProtocol(Protocol):
                                     base_path=entry.relative_to(path).parent)
                     worker.start()
                     workers.append(worker)
-            macros = [flags.apply_predefined_flags(w.get()) for w in workers]
+            macros = flags.apply_predefined_flags_many([w.get() for w in workers])
         return macros
 
     def modFromSubModule(self, mod, index, syncManifest=False, syncReadme=False):